@@ -4,53 +4,181 @@ Gather all .md files from the current directory and subdirectories
 into a single md-snapshot.txt file.
 """
 
+import fnmatch
 import os
+import re
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-ALWAYS_IGNORE = {'.git', '.beads', '.idea', '.vscode', '.gradle', 'build', 'dist', 'node_modules', '__pycache__'}
+ALWAYS_IGNORE = frozenset({
+    '.git', '.beads', '.idea', '.vscode', '.gradle', 'build', 'dist', 'node_modules', '__pycache__',
+    'target', 'public', '.venv', '.next', 'cdk.out',
+})
 
-def read_file_safe(file_path):
+# Files larger than this are not inlined; a placeholder with the size is written instead
+MAX_INLINE = 5 * 1024 * 1024
+
+def load_gitignore(root_path):
+    """Parse .gitignore into (basename_patterns, path_patterns).
+
+    Patterns with an interior slash are anchored to the repo root and only
+    matched against the relative path; the rest only against the basename.
+    """
+    basename_patterns, path_patterns = [], []
+    gitignore_path = root_path / ".gitignore"
+    if not gitignore_path.exists():
+        return basename_patterns, path_patterns
+    with open(gitignore_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            # Handle directory patterns (trailing /)
+            pat = line.strip().rstrip('/')
+            if not pat or pat.startswith('#'):
+                continue
+            if '/' in pat:
+                path_patterns.append(pat.lstrip('/'))
+            else:
+                basename_patterns.append(pat)
+    return basename_patterns, path_patterns
+
+def _compile_patterns(patterns):
+    if not patterns:
+        return None
+    return re.compile('|'.join(f'(?:{fnmatch.translate(pat)})' for pat in patterns))
+
+def compile_gitignore(patterns):
+    """Compile both pattern buckets into regexes; None if there is nothing to match."""
+    basename_patterns, path_patterns = patterns
+    if not basename_patterns and not path_patterns:
+        return None
+    return _compile_patterns(basename_patterns), _compile_patterns(path_patterns)
+
+def matches_gitignore(rel_path_str, gitignore):
+    """Check a relative path against the compiled .gitignore buckets."""
+    if gitignore is None:
+        return False
+    basename_re, path_re = gitignore
+    if basename_re and basename_re.match(os.path.basename(rel_path_str)):
+        return True
+    return bool(path_re and path_re.match(rel_path_str))
+
+def read_file_safe(file_path, dir_fd=None):
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return f.read()
+        # Unbuffered binary read: the whole file is consumed in one go, so the
+        # BufferedReader/TextIOWrapper layers only add allocations and probes.
+        opener = None
+        if dir_fd is not None:
+            # Resolve only the final component against the already-open directory
+            def opener(path, flags):
+                return os.open(os.path.basename(path), flags, dir_fd=dir_fd)
+        with open(file_path, 'rb', buffering=0, opener=opener) as f:
+            size = os.fstat(f.fileno()).st_size
+            if size > MAX_INLINE:
+                return f"[SKIPPED: {size} bytes]"
+            text = f.read().decode('utf-8')
     except (UnicodeDecodeError, PermissionError, OSError) as e:
+        if isinstance(e, OSError) and e.filename is not None:
+            # Report the full path, not the bare name the dir_fd open used
+            e.filename = os.fspath(file_path)
         return f"[UNREADABLE: {type(e).__name__} {e}]"
+    # Match text-mode universal newline handling
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text
+
+def open_dir_fd(dirpath):
+    """Open a directory for dir_fd-relative file opens; None if unsupported or it fails."""
+    if os.open not in os.supports_dir_fd:
+        return None
+    try:
+        return os.open(dirpath, os.O_RDONLY)
+    except OSError:
+        return None
+
+def imap_ordered(ex, fn, items, window):
+    """Like ex.map, but yields (item, result) with at most `window` tasks in flight."""
+    pending = deque()
+    for item in items:
+        if len(pending) >= window:
+            done, fut = pending.popleft()
+            yield done, fut.result()
+        pending.append((item, ex.submit(fn, item)))
+    while pending:
+        done, fut = pending.popleft()
+        yield done, fut.result()
 
 def collect_md_files(root_path):
-    entries = []
+    """Walk for .md files; returns (dirpath, dir_rel, names) batches in walk order without reading."""
+    batches = []
+    gitignore = compile_gitignore(load_gitignore(root_path))
+    # Every dirpath starts with root + separator, so slicing gives the relative path
+    root_len = len(os.path.join(os.fspath(root_path), ''))
 
     for dirpath, dirnames, filenames in os.walk(root_path):
-        dirnames[:] = sorted(d for d in dirnames if d not in ALWAYS_IGNORE)
+        dir_rel = dirpath[root_len:]
+        # Prune in place so os.walk never descends into ignored subtrees
+        dirnames[:] = [
+            d for d in sorted(dirnames)
+            if d not in ALWAYS_IGNORE
+            and not matches_gitignore(os.path.join(dir_rel, d), gitignore)
+        ]
 
-        for filename in sorted(filenames):
-            if not filename.lower().endswith('.md'):
-                continue
+        names = [f for f in sorted(filenames) if f.lower().endswith('.md')]
+        if names:
+            batches.append((dirpath, dir_rel, names))
 
-            file_path = Path(dirpath) / filename
-            rel_path = file_path.relative_to(root_path)
-            content = read_file_safe(file_path)
+    return batches
 
-            entries.append((str(rel_path), content))
+def iter_md_contents(batches):
+    """Yield (rel_path, content) in walk order while reads run on a thread pool."""
+    open_fds = set()
 
-    return entries
+    # One task per file. A directory holding several files is opened once, here
+    # in the submitting thread, and each of its files is resolved against that
+    # fd; single-file directories just use a plain path open.
+    def read_jobs():
+        for dirpath, dir_rel, names in batches:
+            dir_fd = open_dir_fd(dirpath) if len(names) > 1 else None
+            if dir_fd is not None:
+                open_fds.add(dir_fd)
+            last = len(names) - 1
+            for i, name in enumerate(names):
+                yield os.path.join(dir_rel, name), os.path.join(dirpath, name), dir_fd, i == last
 
-def main():
-    root = Path.cwd()
-    md_files = collect_md_files(root)
+    def read_job(job):
+        _, path, dir_fd, _ = job
+        return read_file_safe(path, dir_fd=dir_fd)
 
-    output = []
-    output.append(f"=== MD SNAPSHOT ({len(md_files)} files) ===\n")
+    workers = min(32, (os.cpu_count() or 1) * 4)
+    # The window counts files, not directories, so contents held in flight are
+    # capped at about window * MAX_INLINE (larger files become placeholders)
+    window = workers * 2
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as ex:
+            for (rel_path, _, dir_fd, is_last), content in imap_ordered(ex, read_job, read_jobs(), window):
+                yield rel_path, content
+                # Results arrive in order, so every read against this fd is done
+                if is_last and dir_fd is not None:
+                    os.close(dir_fd)
+                    open_fds.discard(dir_fd)
+    finally:
+        # The pool has drained by now, so no task is still using these
+        for fd in open_fds:
+            os.close(fd)
 
-    for rel_path, content in md_files:
-        output.append(f"--- {rel_path} ---")
-        output.append(content)
-        output.append("")
+def main():
+    root = Path.cwd()
+    batches = collect_md_files(root)
+    count = sum(len(names) for _, _, names in batches)
 
+    # Stream each file straight to disk instead of joining one big string
     output_file = root / "md-snapshot.txt"
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write("\n".join(output))
+    with open(output_file, 'w', encoding='utf-8') as out_f:
+        out_f.write(f"=== MD SNAPSHOT ({count} files) ===\n")
+        for rel_path, content in iter_md_contents(batches):
+            out_f.write(f"\n--- {rel_path} ---\n{content}\n")
 
-    print(f"Generated: {output_file} ({len(md_files)} markdown files)")
+    print(f"Generated: {output_file} ({count} markdown files)")
 
 if __name__ == "__main__":
     main()
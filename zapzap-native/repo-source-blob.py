@@ -9,10 +9,13 @@ No external dependencies.
 
 import fnmatch
 import os
+import re
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Directories to always skip (never appear in tree or content)
-ALWAYS_IGNORE_DIRS = {
+ALWAYS_IGNORE_DIRS = frozenset({
     '.git', '.beads', '.idea', '.vscode', '.gradle', '.claude',
     'build', 'dist', 'node_modules', '__pycache__',
     'target',       # Rust/Cargo build output
@@ -20,153 +23,309 @@ ALWAYS_IGNORE_DIRS = {
     'public',       # static assets (images, audio) — not code
     '.vite',        # Vite dependency cache
     'cdk.out',      # CDK synthesized CloudFormation output
-}
-
-# File extensions to skip entirely (binary/generated, not code)
-SKIP_EXTENSIONS = {
-    '.png', '.jpg', '.jpeg', '.gif', '.bmp', '.webp', '.ico', '.svg',
-    '.mp3', '.wav', '.ogg', '.flac', '.aac',
-    '.wasm', '.o', '.so', '.dylib', '.a',
-    '.zip', '.tar', '.gz', '.br',
-    '.ttf', '.otf', '.woff', '.woff2',
-    '.lock',
-}
+})
+
+# File extensions to skip entirely (binary/generated, not code).
+# Stored without the leading dot and lowercased, to match name.rpartition('.').
+SKIP_EXTENSIONS = frozenset({
+    'png', 'jpg', 'jpeg', 'gif', 'bmp', 'webp', 'ico', 'svg',
+    'mp3', 'wav', 'ogg', 'flac', 'aac',
+    'wasm', 'o', 'so', 'dylib', 'a',
+    'zip', 'tar', 'gz', 'br',
+    'ttf', 'otf', 'woff', 'woff2',
+    'lock',
+})
 
 # Specific filenames to skip
-SKIP_FILES = {
+SKIP_FILES = frozenset({
     'package-lock.json', 'yarn.lock', 'system-state.json',
     'repo-text-blob.py', 'repo_snapshot.txt',
     '.DS_Store', 'Cargo.lock', '.gitkeep',
-}
+})
+
+# Files larger than this are not inlined (accidental dumps, fixtures, minified bundles);
+# a placeholder with the size is written instead
+MAX_INLINE = 5 * 1024 * 1024
 
 
 def load_gitignore(root_path):
-    """Parse .gitignore into a list of patterns."""
+    """Parse .gitignore into (basename_patterns, path_patterns).
+
+    Patterns with an interior slash are anchored to the repo root and only
+    matched against the relative path; the rest only against the basename.
+    """
+    basename_patterns, path_patterns = [], []
     gitignore_path = root_path / ".gitignore"
     if not gitignore_path.exists():
-        return []
+        return basename_patterns, path_patterns
     with open(gitignore_path, 'r', encoding='utf-8') as f:
-        return [
-            line.strip() for line in f
-            if line.strip() and not line.startswith('#')
-        ]
-
-
-def matches_gitignore(rel_path_str, patterns):
-    """Check if a relative path matches any .gitignore pattern."""
-    for pat in patterns:
-        # Handle directory patterns (trailing /)
-        check_pat = pat.rstrip('/')
-        if fnmatch.fnmatch(rel_path_str, check_pat):
-            return True
-        # Also check basename
-        if fnmatch.fnmatch(os.path.basename(rel_path_str), check_pat):
-            return True
-    return False
+        for line in f:
+            # Handle directory patterns (trailing /)
+            pat = line.strip().rstrip('/')
+            if not pat or pat.startswith('#'):
+                continue
+            if '/' in pat:
+                path_patterns.append(pat.lstrip('/'))
+            else:
+                basename_patterns.append(pat)
+    return basename_patterns, path_patterns
 
 
-def should_skip(item, root_path, gitignore_patterns):
-    """Return True if this file/dir should be excluded entirely."""
-    name = item.name
-    if item.is_dir():
-        if name in ALWAYS_IGNORE_DIRS:
-            return True
-        # Also check gitignore for directories
-        if gitignore_patterns:
-            rel = str(item.relative_to(root_path))
-            if matches_gitignore(rel, gitignore_patterns):
-                return True
+def _compile_patterns(patterns):
+    if not patterns:
+        return None
+    return re.compile('|'.join(f'(?:{fnmatch.translate(pat)})' for pat in patterns))
+
+
+def compile_gitignore(patterns):
+    """Compile both pattern buckets into regexes; None if there is nothing to match."""
+    basename_patterns, path_patterns = patterns
+    if not basename_patterns and not path_patterns:
+        return None
+    return _compile_patterns(basename_patterns), _compile_patterns(path_patterns)
+
+
+def matches_gitignore(rel_path_str, gitignore):
+    """Check a relative path against the compiled .gitignore buckets."""
+    if gitignore is None:
         return False
-    # Skip by extension
-    suffix = item.suffix.lower()
-    if suffix in SKIP_EXTENSIONS:
+    basename_re, path_re = gitignore
+    if basename_re and basename_re.match(os.path.basename(rel_path_str)):
         return True
-    if name in SKIP_FILES:
-        return True
-    # Skip via gitignore
-    if gitignore_patterns:
-        rel = str(item.relative_to(root_path))
-        if matches_gitignore(rel, gitignore_patterns):
-            return True
-    return False
+    return bool(path_re and path_re.match(rel_path_str))
 
 
-def generate_tree(dir_path, root_path, gitignore_patterns, prefix=""):
-    """Recursively generate tree structure, omitting ignored entries entirely."""
-    entries = []
-    try:
-        items = sorted([
-            x for x in dir_path.iterdir()
-            if not should_skip(x, root_path, gitignore_patterns)
-        ], key=lambda x: (not x.is_dir(), x.name))
-    except PermissionError:
-        return entries
-
-    for i, item in enumerate(items):
-        is_last = (i == len(items) - 1)
-        connector = "└── " if is_last else "├── "
-        entries.append(f"{prefix}{connector}{item.name}")
+def should_skip(entry, parent_rel, gitignore, is_dir=None):
+    """Return True if this file/dir should be excluded entirely.
 
-        if item.is_dir():
-            extension = "    " if is_last else "│   "
-            entries.extend(generate_tree(item, root_path, gitignore_patterns, prefix + extension))
+    entry can be an os.DirEntry or a Path (anything with .name/.is_dir()).
+    Pass is_dir when the caller already knows it, to avoid asking again.
+    Symlinks to directories get the directory rules; whether to descend into
+    them is up to the walker.
+    """
+    name = entry.name
+    if is_dir is None:
+        is_dir = entry.is_dir()
+    if is_dir:
+        if name in ALWAYS_IGNORE_DIRS:
+            return True
+    else:
+        # Skip by extension or exact filename; an empty stem means no extension
+        # (e.g. '.gitkeep'), same as Path.suffix
+        stem, _, ext = name.rpartition('.')
+        if (stem and ext.lower() in SKIP_EXTENSIONS) or name in SKIP_FILES:
+            return True
+    # Skip via gitignore (directories and files alike)
+    if gitignore:
+        return matches_gitignore(os.path.join(parent_rel, name), gitignore)
+    return False
 
-    return entries
 
+def read_file_safe(file_path, dir_fd=None):
+    """Attempt to read file, return error message if binary/unreadable.
 
-def read_file_safe(file_path):
-    """Attempt to read file, return error message if binary/unreadable."""
+    With dir_fd, only the final component of file_path is resolved, against that
+    directory; error messages still report the full file_path.
+    """
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return f.read()
+        # Unbuffered binary read: the whole file is consumed in one go, so the
+        # BufferedReader/TextIOWrapper layers only add allocations and probes.
+        opener = None
+        if dir_fd is not None:
+            # Resolve only the final component against the already-open directory
+            def opener(path, flags):
+                return os.open(os.path.basename(path), flags, dir_fd=dir_fd)
+        with open(file_path, 'rb', buffering=0, opener=opener) as f:
+            size = os.fstat(f.fileno()).st_size
+            if size > MAX_INLINE:
+                return f"[SKIPPED: {size} bytes]"
+            text = f.read().decode('utf-8')
     except (UnicodeDecodeError, PermissionError, OSError) as e:
+        if isinstance(e, OSError) and e.filename is not None:
+            # Report the full path, not the bare name the dir_fd open used
+            e.filename = os.fspath(file_path)
         return f"[BINARY OR UNREADABLE: {type(e).__name__} {e}]"
+    # Match text-mode universal newline handling
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text
 
 
-def collect_files(root_path, gitignore_patterns):
-    """Walk directory and collect code/doc files with content."""
-    file_entries = []
-
-    for dirpath, dirnames, filenames in os.walk(root_path):
-        dp = Path(dirpath)
-        # Prune ignored directories in-place
-        dirnames[:] = sorted([
-            d for d in dirnames
-            if not should_skip(dp / d, root_path, gitignore_patterns)
-        ])
-
-        for filename in sorted(filenames):
-            file_path = dp / filename
-            if should_skip(file_path, root_path, gitignore_patterns):
-                continue
-
-            rel_path = file_path.relative_to(root_path)
-            content = read_file_safe(file_path)
-            file_entries.append(f"{rel_path};{content!r}")
-
-    return file_entries
+def open_dir_fd(dir_path):
+    """Open a directory for dir_fd-relative file opens; None if unsupported or it fails."""
+    if os.open not in os.supports_dir_fd:
+        return None
+    try:
+        return os.open(dir_path, os.O_RDONLY)
+    except OSError:
+        return None
+
+
+def imap_ordered(ex, fn, items, window):
+    """Like ex.map, but yields (item, result) with at most `window` tasks in flight."""
+    pending = deque()
+    for item in items:
+        if len(pending) >= window:
+            done, fut = pending.popleft()
+            yield done, fut.result()
+        pending.append((item, ex.submit(fn, item)))
+    while pending:
+        done, fut = pending.popleft()
+        yield done, fut.result()
+
+
+def classify(root_path, gitignore):
+    """Walk the repo once and apply every skip rule to each entry exactly once.
+
+    Returns (kept_dirs, batches):
+      kept_dirs maps each listed directory's relative path ('' for the root) to its
+        kept children as sorted (is_file, name) pairs, directories first;
+      batches lists (dir_path, [(rel_path, name), ...]) for directories with kept
+        files, in os.walk order (a directory's files before its subdirs).
+
+    Symlinked directories, broken links and special files still appear in the
+    tree, as leaves: they are never descended into or read.
+    """
+    kept_dirs = {}
+    batches = []
+
+    # Locals are faster than globals/attributes in the per-entry loop
+    _should_skip = should_skip
+    _scandir = os.scandir
+    join = os.path.join
+    add_batch = batches.append
+
+    # Explicit stack instead of recursion; subdirs are pushed in reverse so
+    # they pop in sorted order
+    stack = [(root_path, "")]
+    push = stack.append
+    pop = stack.pop
+
+    while stack:
+        dir_path, rel = pop()
+        try:
+            items = []
+            with _scandir(dir_path) as it:
+                for e in it:
+                    # Type comes from the cached readdir d_type; only symlinks
+                    # need a stat
+                    is_dir = e.is_dir()
+                    if _should_skip(e, rel, gitignore, is_dir):
+                        continue
+                    # Only real directories are descended (no symlink cycles)
+                    # and only regular files (or links to them) are read
+                    if is_dir:
+                        expand = not e.is_symlink()
+                    else:
+                        expand = e.is_file()
+                    items.append((not is_dir, e.name, e.path, expand))
+            # (is_file, name, path, expand): sorts directories first, then by name
+            items.sort()
+        except PermissionError:
+            continue
+
+        kept_dirs[rel] = [(f, n) for f, n, _, _ in items]
+
+        kept = [(join(rel, n), n) for f, n, _, x in items if f and x]
+        if kept:
+            add_batch((dir_path, kept))
+
+        for f, n, p, x in reversed(items):
+            if not f and x:
+                push((p, join(rel, n)))
+
+    return kept_dirs, batches
+
+
+def format_tree(kept_dirs):
+    """Render tree lines from classify()'s kept_dirs; no filesystem access."""
+    tree_lines = []
+    add_line = tree_lines.append
+    join = os.path.join
+
+    # Each item is (prefix, is_last, is_file, name, parent_rel)
+    stack = []
+    push = stack.append
+    pop = stack.pop
+
+    def push_children(prefix, rel):
+        children = kept_dirs.get(rel, ())
+        last = len(children) - 1
+        for i in range(last, -1, -1):
+            is_file, name = children[i]
+            push((prefix, i == last, is_file, name, rel))
+
+    push_children("", "")
+    while stack:
+        prefix, is_last, is_file, name, rel = pop()
+        connector = "└── " if is_last else "├── "
+        add_line(f"{prefix}{connector}{name}")
+        if not is_file:
+            push_children(prefix + ("    " if is_last else "│   "), join(rel, name))
+
+    return tree_lines
+
+
+def iter_file_contents(batches):
+    """Yield (rel_path, content) in walk order while reads run on a thread pool."""
+    open_fds = set()
+
+    # One task per file. A directory holding several files is opened once, here
+    # in the submitting thread, and each of its files is resolved against that
+    # fd; single-file directories just use a plain path open.
+    def read_jobs():
+        for dir_path, kept in batches:
+            dir_fd = open_dir_fd(dir_path) if len(kept) > 1 else None
+            if dir_fd is not None:
+                open_fds.add(dir_fd)
+            last = len(kept) - 1
+            for i, (rel_path, name) in enumerate(kept):
+                yield rel_path, os.path.join(dir_path, name), dir_fd, i == last
+
+    def read_job(job):
+        _, path, dir_fd, _ = job
+        return read_file_safe(path, dir_fd=dir_fd)
+
+    workers = min(32, (os.cpu_count() or 1) * 4)
+    # The window counts files, not directories, so contents held in flight are
+    # capped at about window * MAX_INLINE (larger files become placeholders)
+    window = workers * 2
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as ex:
+            for (rel_path, _, dir_fd, is_last), content in imap_ordered(ex, read_job, read_jobs(), window):
+                yield rel_path, content
+                # Results arrive in order, so every read against this fd is done
+                if is_last and dir_fd is not None:
+                    os.close(dir_fd)
+                    open_fds.discard(dir_fd)
+    finally:
+        # The pool has drained by now, so no task is still using these
+        for fd in open_fds:
+            os.close(fd)
 
 
 def main():
     root = Path.cwd()
-    patterns = load_gitignore(root)
-
-    output = []
-
-    # Tree structure
-    output.append("=== FOLDER TREE ===\n")
-    output.append(f"{root.name}/")
-    output.extend(generate_tree(root, root, patterns))
-    output.append("\n")
-
-    # File contents
-    output.append("=== FILE CONTENTS ===\n")
-    output.extend(collect_files(root, patterns))
+    gitignore = compile_gitignore(load_gitignore(root))
+    kept_dirs, batches = classify(root, gitignore)
+    tree_lines = format_tree(kept_dirs)
 
-    # Write to file
     output_file = root / "repo_snapshot.txt"
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write("\n".join(output))
+    # newline='' keeps '\n' untranslated so the '(N chars)' frame lengths stay exact
+    with open(output_file, 'w', encoding='utf-8', newline='') as out_f:
+        # Tree structure
+        out_f.write("=== FOLDER TREE ===\n\n")
+        out_f.write(f"{root.name}/\n")
+        for line in tree_lines:
+            out_f.write(f"{line}\n")
+        out_f.write("\n\n")
+
+        # File contents, streamed as they are read. Each file is framed by a
+        # header line and written verbatim (no repr/escaping, no joined copy).
+        out_f.write("=== FILE CONTENTS ===\n")
+        for rel_path, content in iter_file_contents(batches):
+            out_f.write(f"\n--- FILE: {rel_path} ({len(content)} chars) ---\n")
+            out_f.write(content)
 
     print(f"Generated: {output_file}")
 
@@ -8,8 +8,10 @@ Walks the Xcode asset catalog and copies image/audio files into:
 """
 
 import json
+import os
 import shutil
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Paths relative to this script's location (zapzap-native/scripts/)
@@ -23,21 +25,53 @@ AUDIO_DIR = REPO_ROOT / "ZapZap Shared" / "AudioResources"
 OUT_ASSETS = PROJECT_ROOT / "public" / "assets"
 OUT_AUDIO = PROJECT_ROOT / "public" / "audio"
 
-IMAGE_EXTS = {".png", ".jpg", ".jpeg"}
-AUDIO_EXTS = {".mp3", ".wav"}
+# Lowercased, without the leading dot (compared against name.rpartition('.'))
+IMAGE_EXTS = {"png", "jpg", "jpeg"}
+AUDIO_EXTS = {"mp3", "wav"}
 
 # Assets we skip (not needed for the game renderer)
 SKIP_DIRS = {"AccentColor.colorset", "AppIcon.appiconset"}
 
+# Copies are independent and I/O-bound; the OS copy calls release the GIL
+COPY_WORKERS = 8
+
+
+def iter_files(root):
+    """Yield a DirEntry for every file under root, using os.scandir to avoid extra stats."""
+    stack = [root]
+    while stack:
+        d = stack.pop()
+        with os.scandir(d) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                else:
+                    yield entry
+
+
+def copy_files(pairs):
+    """Copy (src, dst) pairs on a thread pool; returns once every copy has finished."""
+    # Several sources can flatten to the same output name; keep the last one,
+    # as the old sequential loop did, instead of racing two writers
+    latest = {dst: src for src, dst in pairs}
+    with ThreadPoolExecutor(max_workers=COPY_WORKERS) as ex:
+        list(ex.map(shutil.copyfile, latest.values(), latest.keys()))
+
+
+def write_log(lines):
+    """Emit per-file log lines with a single stdout write instead of one print() each."""
+    if lines:
+        sys.stdout.write("\n".join(lines) + "\n")
+
 
 def extract_textures():
     """Walk .xcassets, find image files inside .textureset/.imageset dirs, copy them out."""
     OUT_ASSETS.mkdir(parents=True, exist_ok=True)
-    count = 0
+    pairs = []
 
     if not XCASSETS_DIR.exists():
         print(f"WARNING: {XCASSETS_DIR} not found, skipping texture extraction")
-        return count
+        return 0
 
     for asset_dir in sorted(XCASSETS_DIR.iterdir()):
         if not asset_dir.is_dir():
@@ -50,38 +84,49 @@ def extract_textures():
         asset_name = asset_dir.stem  # removes .textureset / .imageset
 
         # Walk into the asset dir to find image files
-        for img_file in sorted(asset_dir.rglob("*")):
-            if img_file.suffix.lower() in IMAGE_EXTS:
+        for entry in sorted(iter_files(asset_dir), key=lambda e: e.path):
+            # An empty stem means no extension ('png', '.jpeg'), same as Path.suffix
+            stem, _, ext = entry.name.rpartition('.')
+            ext = ext.lower()
+            if stem and ext in IMAGE_EXTS:
                 # Use the asset_name as the output filename, preserving original extension
                 # Special case: if the actual filename differs significantly (e.g. arrows-haloween.png
                 # inside arrows_haloween.textureset), use the directory-derived name for consistency
-                out_name = f"{asset_name}{img_file.suffix.lower()}"
+                out_name = f"{asset_name}.{ext}"
                 out_path = OUT_ASSETS / out_name
 
-                shutil.copy2(img_file, out_path)
-                print(f"  [IMG] {img_file.name} -> {out_path.relative_to(PROJECT_ROOT)}")
-                count += 1
+                pairs.append((entry.path, out_path))
 
-    return count
+    copy_files(pairs)
+    write_log([
+        f"  [IMG] {os.path.basename(src)} -> {out_path.relative_to(PROJECT_ROOT)}"
+        for src, out_path in pairs
+    ])
+
+    return len(pairs)
 
 
 def extract_audio():
     """Copy MP3/WAV files from AudioResources to public/audio/."""
     OUT_AUDIO.mkdir(parents=True, exist_ok=True)
-    count = 0
+    pairs = []
 
     if not AUDIO_DIR.exists():
         print(f"WARNING: {AUDIO_DIR} not found, skipping audio extraction")
-        return count
+        return 0
 
     for audio_file in sorted(AUDIO_DIR.iterdir()):
-        if audio_file.suffix.lower() in AUDIO_EXTS:
-            out_path = OUT_AUDIO / audio_file.name
-            shutil.copy2(audio_file, out_path)
-            print(f"  [SFX] {audio_file.name} -> {out_path.relative_to(PROJECT_ROOT)}")
-            count += 1
+        stem, _, ext = audio_file.name.rpartition('.')
+        if stem and ext.lower() in AUDIO_EXTS:
+            pairs.append((audio_file, OUT_AUDIO / audio_file.name))
+
+    copy_files(pairs)
+    write_log([
+        f"  [SFX] {audio_file.name} -> {out_path.relative_to(PROJECT_ROOT)}"
+        for audio_file, out_path in pairs
+    ])
 
-    return count
+    return len(pairs)
 
 
 def main():